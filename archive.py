@@ -0,0 +1,442 @@
+# archive.py
+import gzip
+import json
+import os
+import fcntl
+import logging
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+DATA_DIR = "data"
+ARCHIVE_DIR = os.path.join(DATA_DIR, "archive")
+CHECKPOINT_EVERY = 50  # alle N Einträge ein vollständiger Snapshot im Log
+CHUNK_SIZE = 200       # Snapshots pro Chunk im Spaltenarchiv
+COMPACT_AFTER = 1000   # ab so vielen Log-Einträgen wird automatisch kompaktiert
+
+ROUND_FIELDS = ["round_no", "course_no", "strokes", "score_to_par", "holes_played"]
+HOLE_FIELDS = ["round_no", "hole_no", "strokes", "score_class", "is_am_score", "penalty"]
+
+
+def _log_path(event_id, archive_dir: str) -> str:
+    return os.path.join(archive_dir, f"event_{event_id}.log.jsonl")
+
+
+def _columns_path(event_id, archive_dir: str) -> str:
+    return os.path.join(archive_dir, f"event_{event_id}.columns.gz")
+
+
+def _index_path(event_id, archive_dir: str) -> str:
+    return os.path.join(archive_dir, f"event_{event_id}.columns.idx.json")
+
+
+# ------------- Deltas ----------------
+def _round_key(rnd: dict):
+    return rnd.get("round_no")
+
+
+def _diff(previous: dict, current: dict) -> dict | None:
+    """
+    Berechnet die Änderungen zwischen zwei geparsten Scorecards.
+    Rückgabe: None, wenn Runden oder Löcher weggefallen sind oder sich ihre
+    Reihenfolge geändert hat (dann muss ein vollständiger Snapshot geschrieben werden).
+    """
+    prev_rounds = {_round_key(r): r for r in previous.get("rounds", [])}
+    curr_keys = [_round_key(r) for r in current.get("rounds", [])]
+    if curr_keys[:len(prev_rounds)] != list(prev_rounds):
+        return None
+
+    changed = []
+    for rnd in current.get("rounds", []):
+        prev = prev_rounds.get(_round_key(rnd))
+        if prev is None:
+            changed.append(rnd)
+            continue
+        # Neue Löcher dürfen nur hinten dazukommen (z.B. Start auf Loch 10: 10, 11, ..., 1)
+        prev_holes = {h.get("hole_no"): h for h in prev.get("holes", [])}
+        curr_hole_keys = [h.get("hole_no") for h in rnd.get("holes", [])]
+        if curr_hole_keys[:len(prev_holes)] != list(prev_holes):
+            return None
+
+        holes = [h for h in rnd.get("holes", []) if prev_holes.get(h.get("hole_no")) != h]
+        scalars_changed = any(rnd.get(k) != prev.get(k) for k in ROUND_FIELDS)
+        if holes or scalars_changed:
+            entry = {k: v for k, v in rnd.items() if k != "holes"}
+            entry["holes"] = holes
+            changed.append(entry)
+
+    return {"rounds": changed}
+
+
+def _apply(state: dict, delta: dict) -> dict:
+    """
+    Wendet ein Delta auf einen Snapshot an (ohne den alten zu verändern).
+    Bestehende Runden/Löcher bleiben an ihrer Stelle, neue kommen hinten dazu.
+    """
+    rounds = {_round_key(r): r for r in state.get("rounds", [])}
+    for rnd in delta.get("rounds", []):
+        prev = rounds.get(_round_key(rnd))
+        holes = {h.get("hole_no"): h for h in (prev or {}).get("holes", [])}
+        for hole in rnd.get("holes", []):
+            holes[hole.get("hole_no")] = hole
+        merged = {k: v for k, v in rnd.items() if k != "holes"}
+        merged["holes"] = list(holes.values())
+        rounds[_round_key(rnd)] = merged
+
+    new_state = {k: v for k, v in state.items() if k != "rounds"}
+    new_state["rounds"] = list(rounds.values())
+    return new_state
+
+
+# ------------- Sperre ----------------
+@contextmanager
+def _locked(event_id, archive_dir: str):
+    """Exklusive Sperre pro Event, damit Anhängen und Kompaktieren sich nicht überholen."""
+    os.makedirs(archive_dir, exist_ok=True)
+    with open(os.path.join(archive_dir, f"event_{event_id}.lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+# ------------- Log (Deltas + Checkpoints) ----------------
+def _replay(state: dict | None, entry: dict) -> dict:
+    if entry.get("type") == "full" or state is None:
+        return entry["data"]
+    state = _apply(state, entry["delta"])
+    state["timestamp"] = entry["ts"]
+    return state
+
+
+def _iter_log(path: str) -> Iterator[Tuple[str, dict]]:
+    """Liest das Log zeilenweise und rekonstruiert jeden Snapshot."""
+    if not os.path.exists(path):
+        return
+    state = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            state = _replay(state, entry)
+            yield entry["ts"], state
+
+
+# Pfad -> ((Größe, mtime), Anzahl Einträge, letzter Snapshot)
+_LOG_TAIL_CACHE = {}
+
+
+def _log_tail(path: str) -> Tuple[int, dict | None]:
+    """
+    Liefert (Anzahl Einträge, letzter Snapshot) des Logs. Dekodiert wird
+    nur ab dem letzten vollständigen Snapshot; bei unverändertem Log aus dem Cache.
+    """
+    if not os.path.exists(path):
+        return 0, None
+    stat = os.stat(path)
+    key = (stat.st_size, stat.st_mtime_ns)
+    cached = _LOG_TAIL_CACHE.get(path)
+    if cached and cached[0] == key:
+        return cached[1], cached[2]
+
+    with open(path, "r", encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    start = 0
+    for i in range(len(entries) - 1, -1, -1):
+        if entries[i].get("type") == "full":
+            start = i
+            break
+
+    state = None
+    for entry in entries[start:]:
+        state = _replay(state, entry)
+
+    _LOG_TAIL_CACHE[path] = (key, len(entries), state)
+    return len(entries), state
+
+
+def _write_log(path: str, snapshots) -> int:
+    """Schreibt Snapshots als Log (erster Eintrag immer vollständig)."""
+    count = 0
+    previous = None
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for ts, snap in snapshots:
+            f.write(json.dumps(_log_entry(previous, snap, count), ensure_ascii=False) + "\n")
+            previous = snap
+            count += 1
+    os.replace(tmp_path, path)
+    return count
+
+
+def _log_entry(previous: dict | None, current: dict, count: int) -> dict:
+    ts = current.get("timestamp")
+    if previous is not None and count % CHECKPOINT_EVERY != 0:
+        delta = _diff(previous, current)
+        if delta is not None:
+            return {"type": "delta", "ts": ts, "delta": delta}
+    return {"type": "full", "ts": ts, "data": current}
+
+
+def append_snapshot(parsed: dict, archive_dir: str = ARCHIVE_DIR) -> bool:
+    """
+    Hängt eine geparste Scorecard an das Event-Archiv an.
+    Gespeichert wird nur das Delta zum letzten Snapshot, alle
+    CHECKPOINT_EVERY Einträge ein vollständiger Snapshot. Ab COMPACT_AFTER
+    Log-Einträgen wird das Log ins Spaltenarchiv kompaktiert.
+    Rückgabe: True, wenn ein Eintrag geschrieben wurde.
+    """
+    event_id = parsed.get("event_id")
+    path = _log_path(event_id, archive_dir)
+
+    with _locked(event_id, archive_dir):
+        count, previous = _log_tail(path)
+        if previous is None:
+            previous = _last_chunk_snapshot(event_id, archive_dir)
+
+        if previous is not None:
+            delta = _diff(previous, parsed)
+            if delta is not None and not delta["rounds"]:
+                logging.info("Archiv: keine Änderung seit letztem Snapshot.")
+                return False
+
+        entry = _log_entry(previous if count else None, parsed, count)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        stat = os.stat(path)
+        _LOG_TAIL_CACHE[path] = ((stat.st_size, stat.st_mtime_ns), count + 1, parsed)
+
+    logging.info(f"Archiv: {entry['type']}-Eintrag für Event {event_id} gespeichert ({path})")
+
+    # Erst nach Freigabe der Sperre, compact_event sperrt selbst
+    if count + 1 >= COMPACT_AFTER:
+        compact_event(event_id, archive_dir=archive_dir)
+    return True
+
+
+# ------------- Spaltenarchiv ----------------
+# Jeder Chunk ist ein eigenes gzip-Member mit einer JSON-Zeile und beginnt
+# mit einem vollständigen Snapshot. Der Index hält Offset und Zeitraum je Chunk.
+def _empty_columns(snap: dict) -> dict:
+    return {
+        "schema_version": snap.get("schema_version"),
+        "event_id": snap.get("event_id"),
+        "player_id": snap.get("player_id"),
+        "timestamps": [],
+        "resets": [],
+        "rounds": {k: [] for k in ["snapshot"] + ROUND_FIELDS},
+        "holes": {k: [] for k in ["snapshot"] + HOLE_FIELDS},
+    }
+
+
+def _load_index(path: str) -> list:
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("chunks", [])
+
+
+def _iter_log_after(log_path: str, chunks: list) -> Iterator[Tuple[str, dict]]:
+    """
+    Wie _iter_log, überspringt aber Einträge, die schon in einem Chunk liegen.
+    Das passiert, wenn compact_event nach dem Index, aber vor dem Log abbricht.
+    """
+    watermark = chunks[-1]["last_ts"] if chunks else None
+    for ts, snap in _iter_log(log_path):
+        if watermark is None or ts > watermark:
+            yield ts, snap
+
+
+def _read_chunk(path: str, chunk: dict) -> dict:
+    """Liest genau einen Chunk ab seinem Offset, ohne den Rest der Datei zu entpacken."""
+    with open(path, "rb") as f:
+        f.seek(chunk["offset"])
+        data = f.read(chunk["length"])
+    return json.loads(gzip.decompress(data))
+
+
+def _last_chunk_snapshot(event_id, archive_dir: str) -> dict | None:
+    """Letzter Snapshot im Spaltenarchiv (nur der letzte Chunk wird gelesen)."""
+    chunks = _load_index(_index_path(event_id, archive_dir))
+    if not chunks:
+        return None
+    snap = None
+    for _, snap in _iter_columns(_read_chunk(_columns_path(event_id, archive_dir), chunks[-1])):
+        pass
+    return snap
+
+
+def _append_columns(columns: dict, previous: dict | None, snap: dict) -> None:
+    """Schreibt die geänderten Runden/Löcher eines Snapshots als Spaltenzeilen."""
+    idx = len(columns["timestamps"])
+    columns["timestamps"].append(snap.get("timestamp"))
+
+    delta = _diff(previous, snap) if previous is not None else None
+    if delta is None:
+        columns["resets"].append(idx)
+        rounds = snap.get("rounds", [])
+    else:
+        rounds = delta["rounds"]
+
+    for rnd in rounds:
+        columns["rounds"]["snapshot"].append(idx)
+        for k in ROUND_FIELDS:
+            columns["rounds"][k].append(rnd.get(k))
+        for hole in rnd.get("holes", []):
+            columns["holes"]["snapshot"].append(idx)
+            columns["holes"]["round_no"].append(rnd.get("round_no"))
+            for k in HOLE_FIELDS[1:]:
+                columns["holes"][k].append(hole.get(k))
+
+
+def _iter_columns(columns: dict) -> Iterator[Tuple[str, dict]]:
+    """Rekonstruiert die Snapshots eines Chunks der Reihe nach."""
+    resets = set(columns["resets"])
+    rounds_col = columns["rounds"]
+    holes_col = columns["holes"]
+    r_i = h_i = 0
+    state = None
+
+    for idx, ts in enumerate(columns["timestamps"]):
+        delta_rounds = {}
+        while r_i < len(rounds_col["snapshot"]) and rounds_col["snapshot"][r_i] == idx:
+            rnd = {k: rounds_col[k][r_i] for k in ROUND_FIELDS}
+            rnd["holes"] = []
+            delta_rounds[rnd["round_no"]] = rnd
+            r_i += 1
+        while h_i < len(holes_col["snapshot"]) and holes_col["snapshot"][h_i] == idx:
+            hole = {k: holes_col[k][h_i] for k in HOLE_FIELDS[1:]}
+            delta_rounds[holes_col["round_no"][h_i]]["holes"].append(hole)
+            h_i += 1
+
+        if state is None or idx in resets:
+            state = {
+                "schema_version": columns.get("schema_version"),
+                "event_id": columns["event_id"],
+                "player_id": columns["player_id"],
+                "timestamp": ts,
+                "rounds": [],
+            }
+        state = _apply(state, {"rounds": list(delta_rounds.values())})
+        state["timestamp"] = ts
+        yield ts, state
+
+
+def compact_event(event_id, before: str | None = None, archive_dir: str = ARCHIVE_DIR) -> int:
+    """
+    Verschiebt alle Log-Snapshots mit Zeitstempel < before (bzw. alle,
+    wenn before fehlt) als neue Chunks in das komprimierte Spaltenarchiv.
+    Bestehende Chunks werden nicht angefasst; das restliche Log beginnt
+    danach wieder mit einem vollständigen Snapshot.
+    Rückgabe: Anzahl der kompaktierten Snapshots.
+    """
+    log_path = _log_path(event_id, archive_dir)
+    columns_path = _columns_path(event_id, archive_dir)
+    index_path = _index_path(event_id, archive_dir)
+
+    with _locked(event_id, archive_dir):
+        chunks = _load_index(index_path)
+        old, keep = [], []
+        for ts, snap in _iter_log_after(log_path, chunks):
+            (old if before is None or ts < before else keep).append((ts, snap))
+
+        if not old:
+            _write_log(log_path, keep)
+            logging.info(f"Archiv: nichts zu kompaktieren für Event {event_id}.")
+            return 0
+
+        with open(columns_path, "ab") as f:
+            for start in range(0, len(old), CHUNK_SIZE):
+                part = old[start:start + CHUNK_SIZE]
+                columns = _empty_columns(part[0][1])
+                previous = None
+                for _, snap in part:
+                    _append_columns(columns, previous, snap)
+                    previous = snap
+
+                data = gzip.compress(json.dumps(columns, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+                chunks.append({
+                    "offset": f.tell(),
+                    "length": len(data),
+                    "first_ts": part[0][0],
+                    "last_ts": part[-1][0],
+                    "count": len(part)
+                })
+                f.write(data)
+
+        # Erst der Index macht die neuen Chunks sichtbar
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"event_id": event_id, "chunks": chunks}, f, ensure_ascii=False)
+        os.replace(tmp_path, index_path)
+
+        _write_log(log_path, keep)
+
+    logging.info(f"Archiv: {len(old)} Snapshots für Event {event_id} kompaktiert ({columns_path})")
+    return len(old)
+
+
+# ------------- Lesen ----------------
+def iter_snapshots(event_id, archive_dir: str = ARCHIVE_DIR) -> Iterator[Tuple[str, dict]]:
+    """
+    Liefert alle Snapshots eines Events chronologisch als (Zeitstempel, Scorecard),
+    zuerst Chunk für Chunk aus dem Spaltenarchiv, dann aus dem Log.
+    """
+    columns_path = _columns_path(event_id, archive_dir)
+    chunks = _load_index(_index_path(event_id, archive_dir))
+    for chunk in chunks:
+        yield from _iter_columns(_read_chunk(columns_path, chunk))
+    yield from _iter_log_after(_log_path(event_id, archive_dir), chunks)
+
+
+def latest_snapshot(event_id, archive_dir: str = ARCHIVE_DIR) -> dict | None:
+    """
+    Letzter bekannter Stand eines Events: Ende des Logs (gecacht) oder,
+    wenn das Log leer ist, letzter Snapshot im Spaltenarchiv.
+    """
+    _, snap = _log_tail(_log_path(event_id, archive_dir))
+    if snap is None:
+        snap = _last_chunk_snapshot(event_id, archive_dir)
+    return snap
+
+
+def snapshot_at(event_id, timestamp: str, archive_dir: str = ARCHIVE_DIR) -> dict | None:
+    """
+    Rekonstruiert die Scorecard, wie sie zum Zeitpunkt timestamp (ISO-Format)
+    bekannt war. Springt über den Index direkt in den passenden Chunk.
+    Rückgabe: None, wenn es davor keinen Snapshot gibt.
+    """
+    chunks = _load_index(_index_path(event_id, archive_dir))
+    result = None
+    for ts, snap in _iter_log_after(_log_path(event_id, archive_dir), chunks):
+        if ts > timestamp:
+            break
+        result = snap
+    if result is not None:
+        return result
+
+    # Nicht im Log -> letzter Chunk, der vor timestamp beginnt
+    chunk = None
+    for candidate in chunks:
+        if candidate["first_ts"] > timestamp:
+            break
+        chunk = candidate
+    if chunk is None:
+        return None
+
+    for ts, snap in _iter_columns(_read_chunk(_columns_path(event_id, archive_dir), chunk)):
+        if ts > timestamp:
+            break
+        result = snap
+    return result
+
+
+if __name__ == "__main__":
+    # Kompaktierung per Hand: python archive.py <event_id> [before]
+    import sys
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+    if len(sys.argv) < 2:
+        print("Aufruf: python archive.py <event_id> [before]")
+        sys.exit(1)
+    compact_event(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
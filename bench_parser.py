@@ -0,0 +1,53 @@
+# bench_parser.py
+import json
+import time
+import random
+
+from parser import decode_scorecard, SCHEMA_VERSION
+
+PLAYERS = 156   # volles Feld
+ROUNDS = 4
+REPEAT = 5
+
+
+def build_payload(player_id: int) -> dict:
+    """Erzeugt eine Sportdata-ähnliche Rohscorecard mit 4 vollen Runden."""
+    rounds = []
+    for round_no in range(1, ROUNDS + 1):
+        holes = [{
+            "HoleNo": hole_no,
+            "Strokes": random.randint(2, 7),
+            "ScoreClass": random.choice(["EAGLE", "BIRDIE", "PAR", "BOGEY", "DBL_BOGEY"]),
+            "IsAmScore": False,
+            "Penalty": False
+        } for hole_no in range(1, 19)]
+        rounds.append({
+            "RoundNo": round_no,
+            "CourseNo": 1,
+            "Strokes": sum(h["Strokes"] for h in holes),
+            "ScoreToPar": random.randint(-8, 8),
+            "Holes": holes
+        })
+    return {"EventId": 2025100, "PlayerId": player_id, "Rounds": rounds}
+
+
+def main():
+    random.seed(0)
+    bodies = [json.dumps(build_payload(35000 + i)).encode("utf-8") for i in range(PLAYERS)]
+    total_bytes = sum(len(b) for b in bodies)
+
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for body in bodies:
+            decode_scorecard(body)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(f"decode_scorecard (Schema v{SCHEMA_VERSION}): {PLAYERS} Spieler x {ROUNDS} Runden")
+    print(f"Bestzeit: {best * 1000:.1f} ms")
+    print(f"Durchsatz: {total_bytes / best / 1e6:.1f} MB/s, {PLAYERS / best:.0f} Scorecards/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@
 import json
 import os
 import logging
-from typing import Tuple
+from typing import List, Tuple
 
 DATA_DIR = "data"
 LAST_FILE = os.path.join(DATA_DIR, "last_scorecard.json")
@@ -66,6 +66,59 @@ def compare_scorecards(current_path: str) -> Tuple[bool, str]:
     # Wenn nichts geändert
     return False, "Keine Änderung festgestellt."
 
+def hole_changes(previous: dict, current: dict) -> List[dict]:
+    """
+    Vergleicht zwei aufbereitete Scorecards (Format aus parser.py) Loch für Loch.
+    Rückgabe: Liste von Change-Events – "hole" für neue oder geänderte Löcher,
+    "hole_removed"/"round_removed" für Korrekturen, bei denen Daten wegfallen.
+    """
+    events = []
+    prev_rounds = {r.get("round_no"): r for r in (previous or {}).get("rounds", [])}
+    curr_round_nos = {r.get("round_no") for r in current.get("rounds", [])}
+
+    for round_no, rnd in prev_rounds.items():
+        if round_no not in curr_round_nos:
+            events.append({
+                "type": "round_removed",
+                "round_no": round_no,
+                "timestamp": current.get("timestamp")
+            })
+
+    for rnd in current.get("rounds", []):
+        round_no = rnd.get("round_no")
+        prev_holes = {h.get("hole_no"): h for h in prev_rounds.get(round_no, {}).get("holes", [])}
+        curr_hole_nos = {h.get("hole_no") for h in rnd.get("holes", [])}
+
+        for hole_no, prev in prev_holes.items():
+            if hole_no not in curr_hole_nos:
+                events.append({
+                    "type": "hole_removed",
+                    "round_no": round_no,
+                    "hole_no": hole_no,
+                    "previous_strokes": prev.get("strokes"),
+                    "round_strokes": rnd.get("strokes"),
+                    "round_score_to_par": rnd.get("score_to_par"),
+                    "timestamp": current.get("timestamp")
+                })
+
+        for hole in rnd.get("holes", []):
+            prev = prev_holes.get(hole.get("hole_no"))
+            if prev == hole:
+                continue
+            events.append({
+                "type": "hole",
+                "round_no": round_no,
+                "hole_no": hole.get("hole_no"),
+                "strokes": hole.get("strokes"),
+                "previous_strokes": prev.get("strokes") if prev else None,
+                "score_class": hole.get("score_class"),
+                "round_strokes": rnd.get("strokes"),
+                "round_score_to_par": rnd.get("score_to_par"),
+                "timestamp": current.get("timestamp")
+            })
+
+    return events
+
 if __name__ == "__main__":
     # Testlauf
     test_file = os.path.join(DATA_DIR, "scorecard_35703.json")
@@ -39,7 +39,8 @@ def send_discord_message(parsed_json_path: str) -> None:
     title = f"🏌️ Marcel Schneider – Runde {round_no}"
 
     # Score-Header
-    header = f"Schläge: **{strokes}**, Par: **{score_to_par:+}**"
+    par_text = f"{score_to_par:+}" if isinstance(score_to_par, int) else "–"
+    header = f"Schläge: **{strokes if strokes is not None else '–'}**, Par: **{par_text}**"
 
     # Hole-by-Hole-Details als String
     holes_text = ""
@@ -3,14 +3,18 @@ import os
 import logging
 import requests
 
+from parser import decode_scorecard, quarantine_payload, ScorecardValidationError
+from settings import PLAYER_ID  # Marcel Schneider
+
 DATA_DIR = "data"
-PLAYER_ID = 35703  # Marcel Schneider
 
-def fetch_scorecard(event_id: int) -> str | None:
+def fetch_scorecard(event_id: int) -> tuple[str, dict] | None:
     """
     Holt die Scorecard von Marcel Schneider über die Sportdata-API.
     Speichert sie als JSON im data/-Ordner.
-    Gibt den Pfad zur gespeicherten Datei zurück.
+    Gibt (Pfad zur gespeicherten Datei, dekodierte Scorecard) zurück, damit
+    die Antwort nur einmal geprüft und dekodiert wird (None bei Fehlern oder
+    ungültiger Antwort, z.B. HTML-Fehlerseite mit HTTP 200).
     """
     os.makedirs(DATA_DIR, exist_ok=True)
     url = f"https://www.europeantour.com/api/sportdata/Scorecard/Strokeplay/Event/{event_id}/Player/{PLAYER_ID}"
@@ -26,9 +30,22 @@ def fetch_scorecard(event_id: int) -> str | None:
         logging.exception(f"Fehler bei HTTP-Request: {e}")
         return None
 
+    # Antwort prüfen, bevor sie die letzte gültige Scorecard überschreibt
+    try:
+        parsed = decode_scorecard(r.text)
+        if parsed["event_id"] != int(event_id) or parsed["player_id"] != PLAYER_ID:
+            raise ScorecardValidationError(
+                f"Falsche Scorecard: Event {parsed['event_id']}/Player {parsed['player_id']}, "
+                f"erwartet Event {event_id}/Player {PLAYER_ID}"
+            )
+    except ScorecardValidationError as e:
+        logging.error(f"Ungültige Scorecard-Antwort: {e}")
+        quarantine_payload(r.text, f"{url} | {r.headers.get('Content-Type')} | {e}")
+        return None
+
     output_path = os.path.join(DATA_DIR, f"scorecard_{PLAYER_ID}.json")
     with open(output_path, "w", encoding="utf-8") as f:
         f.write(r.text)
 
     logging.info(f"Scorecard gespeichert unter {output_path}")
-    return output_path
\ No newline at end of file
+    return output_path, parsed
\ No newline at end of file
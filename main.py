@@ -7,6 +7,7 @@ from event_id import extract_event_id
 from fetch_scorecard import fetch_scorecard
 from parser import parse_scorecard
 from discord_notify import send_discord_message
+from settings import TOURNAMENT_BASE, MARCEL_SLUG
 
 # --------------------------------------------------------------------
 # Logging Setup
@@ -20,9 +21,7 @@ logging.basicConfig(
 # --------------------------------------------------------------------
 # Konstanten
 # --------------------------------------------------------------------
-TOURNAMENT_BASE = "https://www.europeantour.com/dpworld-tour"
-MARCEL_SLUG = "/dp-world-india-championship-2025"
-PLAYER_ID = 35703
+# Turnier und Spieler stehen in settings.py
 
 # --------------------------------------------------------------------
 # Hauptlogik
@@ -41,13 +40,14 @@ def main():
     logging.info(f"EventId erkannt: {event_id}")
 
     # Scorecard abrufen
-    scorecard_path = fetch_scorecard(event_id)
-    if not scorecard_path:
+    fetched = fetch_scorecard(event_id)
+    if not fetched:
         logging.error("Scorecard konnte nicht abgerufen werden. Abbruch.")
         return
+    scorecard_path, scorecard = fetched
 
-    # Scorecard parsen
-    parsed_path = parse_scorecard(scorecard_path)
+    # Scorecard speichern (bereits beim Abruf geprüft und dekodiert)
+    parsed_path = parse_scorecard(scorecard_path, scorecard)
     if not parsed_path:
         logging.error("Parsing fehlgeschlagen. Abbruch.")
         return
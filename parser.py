@@ -1,74 +1,197 @@
 # parser.py
 import json
 import os
+import re
 import logging
 from datetime import datetime
 
+from archive import append_snapshot
+
 DATA_DIR = "data"
 INPUT_FILE = os.path.join(DATA_DIR, "scorecard_35703.json")
+OUTPUT_FILE = os.path.join(DATA_DIR, "parsed_scorecard_35703.json")  # immer nur der aktuelle Stand
+QUARANTINE_DIR = os.path.join(DATA_DIR, "quarantine")
 
-def parse_scorecard(input_path: str = INPUT_FILE) -> str:
-    """
-    Liest die gespeicherte Scorecard (roh) von Marcel Schneider
-    und speichert pro Runde ein aufbereitetes JSON mit allen Lochdaten.
-    Rückgabe: Pfad zur neuen Datei.
-    """
-    if not os.path.exists(input_path):
-        logging.error(f"Eingabedatei fehlt: {input_path}")
-        raise FileNotFoundError(input_path)
+# Version des aufbereiteten Formats; bei Änderungen an Feldern hochzählen
+SCHEMA_VERSION = 1
 
-    with open(input_path, "r", encoding="utf-8") as f:
-        raw_data = json.load(f)
+RX_INT = re.compile(r"[+-]?[0-9]+")
 
-    event_id = raw_data.get("EventId")
-    player_id = raw_data.get("PlayerId")
-    rounds = raw_data.get("Rounds", [])
 
-    if not rounds:
-        logging.warning(f"Keine Runden in Scorecard gefunden ({input_path})")
-        return ""
+class ScorecardValidationError(ValueError):
+    """Die Rohdaten entsprechen nicht dem erwarteten Sportdata-Schema."""
+
+
+# ------------- Validierung + Dekodierung ----------------
+def _int(value, path: str, optional: bool = True, minimum: int | None = None) -> int | None:
+    """Prüft ein Ganzzahlfeld; Ziffern-Strings werden umgewandelt."""
+    if value is None:
+        if optional:
+            return None
+        raise ScorecardValidationError(f"{path}: Pflichtfeld fehlt")
+    if isinstance(value, bool):
+        raise ScorecardValidationError(f"{path}: Zahl erwartet, bool erhalten")
+    if isinstance(value, str) and RX_INT.fullmatch(value.strip()):
+        value = int(value)
+    if not isinstance(value, int):
+        raise ScorecardValidationError(f"{path}: Zahl erwartet, {type(value).__name__} erhalten")
+    if minimum is not None and value < minimum:
+        raise ScorecardValidationError(f"{path}: Wert {value} kleiner als {minimum}")
+    return value
+
+
+def _str(value, path: str) -> str | None:
+    if value is None or isinstance(value, str):
+        return value
+    raise ScorecardValidationError(f"{path}: Text erwartet, {type(value).__name__} erhalten")
+
+
+def _bool(value, path: str) -> bool | None:
+    if value is None or isinstance(value, bool):
+        return value
+    raise ScorecardValidationError(f"{path}: bool erwartet, {type(value).__name__} erhalten")
+
+
+def _penalty(value, path: str):
+    # Sportdata liefert Penalty je nach Feed als bool oder Strafschlag-Anzahl
+    if value is None or isinstance(value, bool):
+        return value
+    return _int(value, path, minimum=0)
+
+
+def _list(value, path: str) -> list:
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise ScorecardValidationError(f"{path}: Liste erwartet, {type(value).__name__} erhalten")
+    return value
+
+
+def _dict(value, path: str) -> dict:
+    if not isinstance(value, dict):
+        raise ScorecardValidationError(f"{path}: Objekt erwartet, {type(value).__name__} erhalten")
+    return value
+
+
+def decode_scorecard(payload) -> dict:
+    """
+    Prüft die Sportdata-Rohdaten (dict, str oder bytes) und baut in einem
+    Durchlauf das aufbereitete Format (SCHEMA_VERSION) daraus.
+    Wirft ScorecardValidationError bei kaputten oder unerwarteten Daten.
+    """
+    if isinstance(payload, (str, bytes, bytearray)):
+        try:
+            payload = json.loads(payload)
+        except ValueError as e:
+            raise ScorecardValidationError(f"Kein gültiges JSON: {e}") from e
+
+    raw_data = _dict(payload, "$")
 
     parsed = {
-        "event_id": event_id,
-        "player_id": player_id,
+        "schema_version": SCHEMA_VERSION,
+        "event_id": _int(raw_data.get("EventId"), "EventId", optional=False),
+        "player_id": _int(raw_data.get("PlayerId"), "PlayerId", optional=False),
         "timestamp": datetime.utcnow().isoformat(),
         "rounds": []
     }
 
-    for rnd in rounds:
-        round_no = rnd.get("RoundNo")
-        course_no = rnd.get("CourseNo")
-        strokes = rnd.get("Strokes")
-        score_to_par = rnd.get("ScoreToPar")
-        holes = rnd.get("Holes", [])
+    round_nos = set()
+    for r_i, rnd in enumerate(_list(raw_data.get("Rounds"), "Rounds")):
+        r_path = f"Rounds[{r_i}]"
+        rnd = _dict(rnd, r_path)
+        holes = _list(rnd.get("Holes"), f"{r_path}.Holes")
 
         parsed_round = {
-            "round_no": round_no,
-            "course_no": course_no,
-            "strokes": strokes,
-            "score_to_par": score_to_par,
+            "round_no": _int(rnd.get("RoundNo"), f"{r_path}.RoundNo", optional=False, minimum=1),
+            "course_no": _int(rnd.get("CourseNo"), f"{r_path}.CourseNo"),
+            "strokes": _int(rnd.get("Strokes"), f"{r_path}.Strokes", minimum=0),
+            "score_to_par": _int(rnd.get("ScoreToPar"), f"{r_path}.ScoreToPar"),
             "holes_played": len(holes),
             "holes": []
         }
+        # Archiv und Change-Feed schlüsseln nach Runden-/Lochnummer
+        if parsed_round["round_no"] in round_nos:
+            raise ScorecardValidationError(f"{r_path}.RoundNo: Runde {parsed_round['round_no']} doppelt")
+        round_nos.add(parsed_round["round_no"])
 
-        for hole in holes:
+        hole_nos = set()
+        for h_i, hole in enumerate(holes):
+            h_path = f"{r_path}.Holes[{h_i}]"
+            hole = _dict(hole, h_path)
+            hole_no = _int(hole.get("HoleNo"), f"{h_path}.HoleNo", optional=False, minimum=1)
+            if hole_no in hole_nos:
+                raise ScorecardValidationError(f"{h_path}.HoleNo: Loch {hole_no} doppelt")
+            hole_nos.add(hole_no)
             parsed_round["holes"].append({
-                "hole_no": hole.get("HoleNo"),
-                "strokes": hole.get("Strokes"),
-                "score_class": hole.get("ScoreClass"),
-                "is_am_score": hole.get("IsAmScore"),
-                "penalty": hole.get("Penalty")
+                "hole_no": hole_no,
+                "strokes": _int(hole.get("Strokes"), f"{h_path}.Strokes", minimum=0),
+                "score_class": _str(hole.get("ScoreClass"), f"{h_path}.ScoreClass"),
+                "is_am_score": _bool(hole.get("IsAmScore"), f"{h_path}.IsAmScore"),
+                "penalty": _penalty(hole.get("Penalty"), f"{h_path}.Penalty")
             })
 
         parsed["rounds"].append(parsed_round)
 
-    # Speicherpfad mit Zeitstempel
+    return parsed
+
+
+def quarantine_payload(content: str, reason: str, name: str = "scorecard") -> str:
+    """
+    Legt eine ungültige Rohantwort unter data/quarantine/ ab, damit sie
+    weder Diff noch Discord erreicht, aber später untersucht werden kann.
+    Rückgabe: Pfad zur Quarantäne-Datei.
+    """
+    os.makedirs(QUARANTINE_DIR, exist_ok=True)
     timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H-%M-%S")
-    output_path = os.path.join(DATA_DIR, f"parsed_scorecard_35703_{timestamp}.json")
+    path = os.path.join(QUARANTINE_DIR, f"{name}_{timestamp}.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"# {reason}\n")
+        f.write(content)
+    logging.warning(f"Ungültige Scorecard in Quarantäne verschoben: {path} ({reason})")
+    return path
+
+
+def parse_scorecard(input_path: str = INPUT_FILE, parsed: dict | None = None) -> str:
+    """
+    Liest die gespeicherte Scorecard (roh) von Marcel Schneider
+    und speichert pro Runde ein aufbereitetes JSON mit allen Lochdaten.
+    Wurde die Scorecard schon von fetch_scorecard dekodiert, wird parsed
+    direkt übernommen statt die Datei erneut zu lesen.
+    Die Datei wird bei jedem Lauf überschrieben; der Verlauf liegt im Archiv.
+    Rückgabe: Pfad zur Datei ("" bei leeren oder ungültigen Daten).
+    """
+    if parsed is None:
+        if not os.path.exists(input_path):
+            logging.error(f"Eingabedatei fehlt: {input_path}")
+            raise FileNotFoundError(input_path)
+
+        with open(input_path, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        try:
+            parsed = decode_scorecard(content)
+        except ScorecardValidationError as e:
+            logging.error(f"Scorecard ungültig ({input_path}): {e}")
+            quarantine_payload(content, str(e))
+            return ""
 
+    if not parsed["rounds"]:
+        logging.warning(f"Keine Runden in Scorecard gefunden ({input_path})")
+        return ""
+
+    output_path = OUTPUT_FILE
     os.makedirs(DATA_DIR, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as out:
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as out:
         json.dump(parsed, out, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, output_path)
 
     logging.info(f"Parsed Scorecard gespeichert unter {output_path}")
-    return output_path
\ No newline at end of file
+
+    # Delta-Archiv fortschreiben (Fehler hier sollen den Lauf nicht abbrechen)
+    try:
+        append_snapshot(parsed)
+    except Exception as e:
+        logging.exception(f"Fehler beim Archivieren der Scorecard: {e}")
+
+    return output_path
@@ -0,0 +1,263 @@
+# server.py
+import json
+import os
+import sys
+import time
+import hashlib
+import logging
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from archive import append_snapshot, latest_snapshot
+from diff_checker import hole_changes
+from event_id import extract_event_id
+from fetch_scorecard import fetch_scorecard
+from settings import TOURNAMENT_BASE, MARCEL_SLUG
+
+# --------------------------------------------------------------------
+# Konstanten
+# --------------------------------------------------------------------
+HOST = os.getenv("SCORECARD_HOST", "127.0.0.1")
+PORT = int(os.getenv("SCORECARD_PORT", "8080"))
+POLL_INTERVAL = int(os.getenv("SCORECARD_POLL_INTERVAL", "300"))  # Sekunden zwischen Upstream-Abrufen
+EVENT_BUFFER = 500       # so viele Change-Events bleiben für Last-Event-ID abrufbar
+HEARTBEAT_INTERVAL = 15  # Sekunden bis zum SSE-Keepalive
+
+
+# --------------------------------------------------------------------
+# In-Memory-Zustand
+# --------------------------------------------------------------------
+class ScorecardState:
+    """
+    Hält die aktuelle Scorecard samt ETag und die letzten Change-Events.
+    Alle HTTP-Clients lesen hieraus; nur der Poller schreibt.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._scorecard = None
+        self._body = b""
+        self._etag = None
+        self._events = deque(maxlen=EVENT_BUFFER)
+        self._next_event_id = 1
+        # Event-IDs lauten "<boot>-<n>", damit sie über Neustarts hinweg eindeutig bleiben
+        self.boot = str(int(time.time() * 1000))
+
+    def update(self, parsed: dict) -> int:
+        """
+        Übernimmt eine neue Scorecard und erzeugt Change-Events. Unterscheidet sie
+        sich nur im Zeitstempel, bleiben Body und ETag unverändert.
+        Rückgabe: Anzahl Events.
+        """
+        content = {k: v for k, v in parsed.items() if k != "timestamp"}
+        etag = '"' + hashlib.sha1(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest() + '"'
+
+        with self._cond:
+            if etag == self._etag:
+                return 0
+            changes = hole_changes(self._scorecard, parsed) if self._scorecard else []
+            self._scorecard = parsed
+            self._body = json.dumps(parsed, ensure_ascii=False).encode("utf-8")
+            self._etag = etag
+            for change in changes:
+                self._events.append((self._next_event_id, change))
+                self._next_event_id += 1
+            self._cond.notify_all()
+        return len(changes)
+
+    def snapshot(self):
+        """Rückgabe: (Scorecard, JSON-Body, ETag) – alles None/leer vor dem ersten Abruf."""
+        with self._cond:
+            return self._scorecard, self._body, self._etag
+
+    def events_after(self, last_id: int, timeout: float):
+        """Wartet bis zu timeout Sekunden auf Events mit ID > last_id."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._next_event_id - 1 > last_id, timeout=timeout)
+            return [(i, e) for i, e in self._events if i > last_id]
+
+    def last_event_id(self) -> int:
+        with self._cond:
+            return self._next_event_id - 1
+
+    def resume_from(self, header: str | None) -> int:
+        """
+        Wertet einen Last-Event-ID-Header aus. Rückgabe: laufende Nummer, ab der
+        gesendet wird. IDs aus einem früheren Serverlauf oder aus der Zukunft
+        gelten als veraltet -> alle gepufferten Events dieses Laufs.
+        """
+        if not header:
+            return self.last_event_id()  # neue Clients bekommen nur künftige Events
+        boot, _, number = header.strip().partition("-")
+        if boot != self.boot or not number.isdigit() or int(number) > self.last_event_id():
+            return 0
+        return int(number)
+
+    def format_id(self, number: int) -> str:
+        return f"{self.boot}-{number}"
+
+
+def leaderboard_entry(parsed: dict) -> dict:
+    """Kompakte Zeile für Dashboard/Overlay: Gesamtscore und Stand der letzten Runde."""
+    rounds = parsed.get("rounds", [])
+    latest = rounds[-1] if rounds else {}
+    return {
+        "event_id": parsed.get("event_id"),
+        "player_id": parsed.get("player_id"),
+        "total_strokes": sum(r.get("strokes") or 0 for r in rounds),
+        "total_to_par": sum(r.get("score_to_par") or 0 for r in rounds),
+        "current_round": latest.get("round_no"),
+        "thru": latest.get("holes_played"),
+        "rounds": [{k: r.get(k) for k in ("round_no", "strokes", "score_to_par", "holes_played")} for r in rounds],
+        "timestamp": parsed.get("timestamp")
+    }
+
+
+# --------------------------------------------------------------------
+# HTTP
+# --------------------------------------------------------------------
+class ScorecardHandler(BaseHTTPRequestHandler):
+    state: ScorecardState = None  # wird von make_server gesetzt
+
+    def log_message(self, fmt, *args):
+        logging.debug(f"HTTP {self.address_string()} {fmt % args}")
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/scorecard":
+            self._send_state(lambda parsed, body: body)
+        elif path == "/leaderboard":
+            self._send_state(lambda parsed, body: json.dumps(leaderboard_entry(parsed), ensure_ascii=False).encode("utf-8"))
+        elif path == "/events":
+            self._stream_events()
+        elif path == "/health":
+            self._send_json(200, {"ok": True, "last_event_id": self.state.format_id(self.state.last_event_id())})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def _send_json(self, status: int, data: dict, headers: dict | None = None) -> None:
+        self._send_body(status, json.dumps(data).encode("utf-8"), headers)
+
+    def _send_body(self, status: int, body: bytes, headers: dict | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_state(self, render) -> None:
+        parsed, body, etag = self.state.snapshot()
+        if parsed is None:
+            self._send_json(503, {"error": "noch keine Scorecard geladen"}, {"Retry-After": "30"})
+            return
+
+        # Alle Sichten leiten sich aus derselben Scorecard ab -> ein ETag pro Pfad
+        etag = etag[:-1] + "-" + self.path.split("?", 1)[0].strip("/") + '"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if_none_match = self.headers.get("If-None-Match", "")
+        if etag in [t.strip() for t in if_none_match.split(",")] or if_none_match.strip() == "*":
+            self.send_response(304)
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.end_headers()
+            return
+
+        self._send_body(200, render(parsed, body), headers)
+
+    def _stream_events(self) -> None:
+        last_id = self.state.resume_from(self.headers.get("Last-Event-ID"))
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "keep-alive")
+        self.end_headers()
+
+        try:
+            self.wfile.write(f"retry: {HEARTBEAT_INTERVAL * 1000}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            while True:
+                events = self.state.events_after(last_id, HEARTBEAT_INTERVAL)
+                if not events:
+                    self.wfile.write(b": keepalive\n\n")
+                for event_id, change in events:
+                    data = json.dumps(change, ensure_ascii=False)
+                    self.wfile.write(f"id: {self.state.format_id(event_id)}\nevent: {change['type']}\ndata: {data}\n\n".encode("utf-8"))
+                    last_id = event_id
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            logging.debug(f"SSE-Client getrennt: {self.address_string()}")
+
+
+def make_server(state: ScorecardState, host: str = HOST, port: int = PORT) -> ThreadingHTTPServer:
+    handler = type("BoundScorecardHandler", (ScorecardHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+# --------------------------------------------------------------------
+# Upstream-Poller (ein Abruf für alle Clients)
+# --------------------------------------------------------------------
+def poll_once(state: ScorecardState, event_id: int) -> bool:
+    """Holt und dekodiert die Scorecard einmal. Rückgabe: True bei Erfolg."""
+    fetched = fetch_scorecard(event_id)
+    if not fetched:
+        return False
+    _, parsed = fetched
+
+    n_events = state.update(parsed)
+    if n_events:
+        logging.info(f"Scorecard aktualisiert, {n_events} Change-Events")
+    try:
+        append_snapshot(parsed)
+    except Exception as e:
+        logging.exception(f"Fehler beim Archivieren der Scorecard: {e}")
+    return True
+
+
+def poll_forever(state: ScorecardState, event_id: int, interval: int = POLL_INTERVAL) -> None:
+    while True:
+        try:
+            poll_once(state, event_id)
+        except Exception as e:
+            logging.exception(f"Fehler beim Abruf: {e}")
+        time.sleep(interval)
+
+
+def main():
+    event_page_url = f"{TOURNAMENT_BASE}{MARCEL_SLUG}"
+    event_id = extract_event_id(event_page_url)
+    if not event_id:
+        logging.error("EventId wurde nicht gefunden. Abbruch.")
+        return
+
+    state = ScorecardState()
+
+    # Letzten bekannten Stand aus dem Archiv übernehmen, damit Clients sofort Daten bekommen
+    latest = latest_snapshot(event_id)
+    if latest:
+        state.update(latest)
+
+    threading.Thread(target=poll_forever, args=(state, event_id), daemon=True).start()
+
+    server = make_server(state)
+    logging.info(f"Scorecard-API läuft auf http://{HOST}:{PORT} (Event {event_id})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(message)s",
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+    main()
@@ -0,0 +1,6 @@
+# settings.py
+# Gemeinsame Turnier-Konstanten für Bot (main.py) und Scorecard-API (server.py)
+
+TOURNAMENT_BASE = "https://www.europeantour.com/dpworld-tour"
+MARCEL_SLUG = "/dp-world-india-championship-2025"
+PLAYER_ID = 35703
@@ -0,0 +1,133 @@
+# test_archive.py
+import copy
+
+import pytest
+
+import archive
+from parser import SCHEMA_VERSION
+
+
+def make_snapshots(n: int) -> list:
+    """Erzeugt n aufeinanderfolgende Scorecards; bei i == 6 wird ein Loch korrigiert (entfernt)."""
+    snapshots = []
+    snap = {
+        "schema_version": SCHEMA_VERSION,
+        "event_id": 1,
+        "player_id": 35703,
+        "timestamp": "",
+        "rounds": [{"round_no": 1, "course_no": 1, "strokes": 0, "score_to_par": 0, "holes_played": 0, "holes": []}]
+    }
+    for i in range(n):
+        snap = copy.deepcopy(snap)
+        snap["timestamp"] = f"2025-01-01T00:00:{i:02d}"
+        if i == 10:
+            snap["rounds"].append({"round_no": 2, "course_no": 1, "strokes": 0, "score_to_par": 0, "holes_played": 0, "holes": []})
+        rnd = snap["rounds"][-1]
+        rnd["holes"].append({"hole_no": len(rnd["holes"]) + 1, "strokes": 4, "score_class": "PAR", "is_am_score": False, "penalty": None})
+        if i == 6:
+            rnd["holes"] = rnd["holes"][:2]
+        rnd["holes_played"] = len(rnd["holes"])
+        rnd["strokes"] = sum(h["strokes"] for h in rnd["holes"])
+        snapshots.append(snap)
+    return snapshots
+
+
+def test_log_compact_roundtrip(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "CHECKPOINT_EVERY", 3)
+    monkeypatch.setattr(archive, "CHUNK_SIZE", 4)
+    snapshots = make_snapshots(15)
+    for snap in snapshots:
+        assert archive.append_snapshot(snap, archive_dir=str(tmp_path))
+    assert not archive.append_snapshot(snapshots[-1], archive_dir=str(tmp_path))
+
+    def stored():
+        return [snap for _, snap in archive.iter_snapshots(1, archive_dir=str(tmp_path))]
+
+    assert stored() == snapshots
+    assert archive.compact_event(1, "2025-01-01T00:00:07", archive_dir=str(tmp_path)) == 7
+    assert stored() == snapshots
+    assert archive.compact_event(1, archive_dir=str(tmp_path)) == 8
+    assert stored() == snapshots
+
+    # Nach der Kompaktierung beginnt das Log neu und Deltas bauen korrekt darauf auf
+    extra = make_snapshots(16)[-1]
+    assert archive.append_snapshot(extra, archive_dir=str(tmp_path))
+    assert stored() == snapshots + [extra]
+
+
+def test_snapshot_at_around_checkpoints(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "CHECKPOINT_EVERY", 3)
+    monkeypatch.setattr(archive, "CHUNK_SIZE", 4)
+    snapshots = make_snapshots(12)
+    for snap in snapshots:
+        archive.append_snapshot(snap, archive_dir=str(tmp_path))
+    archive.compact_event(1, "2025-01-01T00:00:09", archive_dir=str(tmp_path))
+
+    assert archive.snapshot_at(1, "2024-12-31T23:59:59", archive_dir=str(tmp_path)) is None
+    # Chunk-Grenzen (0-3, 4-7, 8) und Log-Checkpoints (9, danach Deltas)
+    for i in (2, 3, 4, 5, 8, 9, 10, 11):
+        ts = f"2025-01-01T00:00:{i:02d}"
+        assert archive.snapshot_at(1, ts, archive_dir=str(tmp_path)) == snapshots[i]
+        assert archive.snapshot_at(1, ts + ".5", archive_dir=str(tmp_path)) == snapshots[i]
+    assert archive.snapshot_at(1, "2026-01-01T00:00:00", archive_dir=str(tmp_path)) == snapshots[-1]
+
+
+
+def test_back_nine_start_keeps_hole_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "CHECKPOINT_EVERY", 4)
+    monkeypatch.setattr(archive, "CHUNK_SIZE", 3)
+    snapshots = []
+    snap = make_snapshots(1)[0]
+    snap["rounds"][0]["holes"] = []
+    for i, hole_no in enumerate([10, 11, 12, 13, 14, 15, 16, 17, 18, 1, 2, 3]):
+        snap = copy.deepcopy(snap)
+        snap["timestamp"] = f"2025-01-01T00:00:{i:02d}"
+        snap["rounds"][0]["holes"].append({"hole_no": hole_no, "strokes": 4, "score_class": "PAR", "is_am_score": False, "penalty": None})
+        snapshots.append(snap)
+        archive.append_snapshot(snap, archive_dir=str(tmp_path))
+
+    def stored():
+        return [snap for _, snap in archive.iter_snapshots(1, archive_dir=str(tmp_path))]
+
+    assert stored() == snapshots
+    archive.compact_event(1, "2025-01-01T00:00:07", archive_dir=str(tmp_path))
+    assert stored() == snapshots
+    archive.compact_event(1, archive_dir=str(tmp_path))
+    assert stored() == snapshots
+
+
+def test_compaction_crash_before_log_rewrite(tmp_path, monkeypatch):
+    snapshots = make_snapshots(6)
+    for snap in snapshots:
+        archive.append_snapshot(snap, archive_dir=str(tmp_path))
+
+    def crash(path, snapshots):
+        raise OSError("Absturz")
+
+    monkeypatch.setattr(archive, "_write_log", crash)
+    with pytest.raises(OSError):
+        archive.compact_event(1, "2025-01-01T00:00:04", archive_dir=str(tmp_path))
+    monkeypatch.undo()
+
+    stored = [snap for _, snap in archive.iter_snapshots(1, archive_dir=str(tmp_path))]
+    assert stored == snapshots
+    assert archive.snapshot_at(1, "2025-01-01T00:00:02", archive_dir=str(tmp_path)) == snapshots[2]
+
+    # Die nächste Kompaktierung räumt das Log auf, ohne Chunks doppelt zu schreiben
+    archive.compact_event(1, archive_dir=str(tmp_path))
+    stored = [snap for _, snap in archive.iter_snapshots(1, archive_dir=str(tmp_path))]
+    assert stored == snapshots
+
+
+def test_append_compacts_automatically(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "COMPACT_AFTER", 5)
+    snapshots = make_snapshots(12)
+    for snap in snapshots:
+        archive.append_snapshot(snap, archive_dir=str(tmp_path))
+
+    assert archive._log_tail(archive._log_path(1, str(tmp_path)))[0] < 5
+    assert [snap for _, snap in archive.iter_snapshots(1, archive_dir=str(tmp_path))] == snapshots
+    # Unveränderter Stand direkt nach der Kompaktierung wird nicht erneut gespeichert
+    archive.compact_event(1, archive_dir=str(tmp_path))
+    assert not archive.append_snapshot(snapshots[-1], archive_dir=str(tmp_path))
+    assert archive.latest_snapshot(1, archive_dir=str(tmp_path)) == snapshots[-1]
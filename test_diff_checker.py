@@ -0,0 +1,43 @@
+# test_diff_checker.py
+from diff_checker import hole_changes
+
+
+def scorecard(*rounds) -> dict:
+    return {
+        "event_id": 1,
+        "player_id": 35703,
+        "timestamp": "2025-01-01T00:00:00",
+        "rounds": [
+            {"round_no": round_no, "strokes": sum(strokes), "score_to_par": 0,
+             "holes": [{"hole_no": i, "strokes": s} for i, s in enumerate(strokes, start=1)]}
+            for round_no, strokes in rounds
+        ]
+    }
+
+
+def test_hole_changes_reports_new_and_changed_holes():
+    previous = scorecard((1, [4, 4]))
+    current = scorecard((1, [5, 4, 3]))
+
+    changes = hole_changes(previous, current)
+    assert [(c["type"], c["round_no"], c["hole_no"], c["previous_strokes"], c["strokes"]) for c in changes] == [
+        ("hole", 1, 1, 4, 5),
+        ("hole", 1, 3, None, 3),
+    ]
+    assert hole_changes(current, current) == []
+
+
+def test_hole_changes_reports_removed_holes_and_rounds():
+    previous = scorecard((1, [4, 4, 4]), (2, [3]))
+    current = scorecard((1, [4, 4]))
+
+    changes = hole_changes(previous, current)
+    assert [(c["type"], c["round_no"], c.get("hole_no")) for c in changes] == [
+        ("round_removed", 2, None),
+        ("hole_removed", 1, 3),
+    ]
+    assert changes[1]["previous_strokes"] == 4
+
+
+def test_hole_changes_without_previous_reports_everything():
+    assert len(hole_changes(None, scorecard((1, [4, 4])))) == 2
@@ -0,0 +1,45 @@
+# test_fetch_scorecard.py
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import fetch_scorecard
+
+BODY = {"EventId": 2025100, "PlayerId": 35703, "Rounds": [{"RoundNo": 1, "Holes": [{"HoleNo": 1, "Strokes": 4}]}]}
+
+
+@pytest.fixture
+def respond(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def set_response(text, status=200):
+        response = SimpleNamespace(status_code=status, text=text, headers={"Content-Type": "text/html"})
+        monkeypatch.setattr(fetch_scorecard.requests, "get", lambda url, timeout: response)
+
+    return set_response
+
+
+def test_fetch_returns_path_and_decoded_scorecard(respond):
+    respond(json.dumps(BODY))
+    path, parsed = fetch_scorecard.fetch_scorecard(2025100)
+    assert os.path.exists(path)
+    assert parsed["rounds"][0]["holes"][0]["strokes"] == 4
+
+
+@pytest.mark.parametrize("text", [
+    "<html>Wartungsarbeiten</html>",
+    json.dumps({"Message": "An error has occurred."}),
+    json.dumps(dict(BODY, EventId=1)),
+])
+def test_fetch_quarantines_invalid_body(respond, text):
+    respond(json.dumps(BODY))
+    fetch_scorecard.fetch_scorecard(2025100)
+
+    respond(text)
+    assert fetch_scorecard.fetch_scorecard(2025100) is None
+    assert len(os.listdir(os.path.join("data", "quarantine"))) == 1
+    # Die letzte gültige Scorecard bleibt erhalten
+    with open(os.path.join("data", "scorecard_35703.json"), encoding="utf-8") as f:
+        assert json.load(f) == BODY
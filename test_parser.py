@@ -0,0 +1,43 @@
+# test_parser.py
+import pytest
+
+from parser import SCHEMA_VERSION, ScorecardValidationError, decode_scorecard
+
+
+def test_decode_scorecard_valid():
+    parsed = decode_scorecard(
+        '{"EventId": 2025100, "PlayerId": "35703", "Rounds": [{"RoundNo": 1, "ScoreToPar": "-2",'
+        ' "Holes": [{"HoleNo": 1, "Strokes": 3, "ScoreClass": "BIRDIE", "IsAmScore": false, "Penalty": 0}]}]}'
+    )
+    assert parsed["schema_version"] == SCHEMA_VERSION
+    assert parsed["player_id"] == 35703
+    assert parsed["rounds"][0]["score_to_par"] == -2
+    assert parsed["rounds"][0]["holes"][0]["strokes"] == 3
+
+
+@pytest.mark.parametrize("body", [
+    "<html><body>Service Unavailable</body></html>",
+    "",
+    "[]",
+    '"Scorecard"',
+    '{"Message": "An error has occurred."}',
+    '{"EventId": "²", "PlayerId": 35703}',
+    '{"EventId": 1, "PlayerId": 35703, "Rounds": {}}',
+    '{"EventId": 1, "PlayerId": 35703, "Rounds": [{"RoundNo": true}]}',
+    '{"EventId": 1, "PlayerId": 35703, "Rounds": [{"RoundNo": 1, "Holes": [{"HoleNo": 1, "Strokes": "vier"}]}]}',
+    '{"EventId": 1, "PlayerId": 35703, "Rounds": [{"RoundNo": 1, "Holes": [{"HoleNo": 1, "ScoreClass": 5}]}]}',
+    '{"EventId": 1, "PlayerId": 35703, "Rounds": [{"RoundNo": 1, "Holes": [{"HoleNo": 1, "Penalty": -1}]}]}',
+    '{"EventId": 1, "PlayerId": 35703, "Rounds": [{"RoundNo": 1}, {"RoundNo": 1}]}',
+    '{"EventId": 1, "PlayerId": 35703, "Rounds": [{"RoundNo": 1, "Holes": [{"HoleNo": 1}, {"HoleNo": 1}]}]}',
+])
+def test_decode_scorecard_rejects(body):
+    with pytest.raises(ScorecardValidationError):
+        decode_scorecard(body)
+
+
+
+def test_decode_scorecard_keeps_hole_order():
+    parsed = decode_scorecard(
+        '{"EventId": 1, "PlayerId": 35703, "Rounds": [{"RoundNo": 1, "Holes": [{"HoleNo": 10}, {"HoleNo": 1}]}]}'
+    )
+    assert [h["hole_no"] for h in parsed["rounds"][0]["holes"]] == [10, 1]
@@ -0,0 +1,117 @@
+# test_server.py
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import server
+
+
+def scorecard(strokes: list, timestamp: str = "2025-01-01T00:00:00") -> dict:
+    return {
+        "schema_version": 1,
+        "event_id": 1,
+        "player_id": 35703,
+        "timestamp": timestamp,
+        "rounds": [{"round_no": 1, "course_no": 1, "strokes": sum(strokes), "score_to_par": 0,
+                    "holes_played": len(strokes),
+                    "holes": [{"hole_no": i, "strokes": s} for i, s in enumerate(strokes, start=1)]}]
+    }
+
+
+@pytest.fixture
+def api():
+    state = server.ScorecardState()
+    httpd = server.make_server(state, "127.0.0.1", 0)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield state, f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get(url: str, headers: dict | None = None):
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers or {}), timeout=5) as r:
+            return r.status, r.headers, r.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_503_before_first_poll(api):
+    _, base = api
+    status, headers, _ = get(base + "/scorecard")
+    assert status == 503
+    assert headers["Retry-After"]
+
+
+def test_etag_and_304(api):
+    state, base = api
+    state.update(scorecard([4, 4]))
+
+    status, headers, body = get(base + "/scorecard")
+    assert status == 200
+    assert json.loads(body)["rounds"][0]["strokes"] == 8
+    etag = headers["ETag"]
+    assert get(base + "/scorecard", {"If-None-Match": etag})[0] == 304
+
+    # Leaderboard hat ein eigenes ETag
+    _, lb_headers, _ = get(base + "/leaderboard")
+    assert lb_headers["ETag"] != etag
+    assert get(base + "/leaderboard", {"If-None-Match": etag})[0] == 200
+    assert get(base + "/leaderboard", {"If-None-Match": lb_headers["ETag"]})[0] == 304
+
+    # Neuer Poll mit gleichem Inhalt, nur anderer Zeitstempel -> weiterhin 304
+    state.update(scorecard([4, 4], timestamp="2025-01-01T01:00:00"))
+    assert get(base + "/scorecard", {"If-None-Match": etag})[0] == 304
+
+    state.update(scorecard([4, 4, 3]))
+    assert get(base + "/scorecard", {"If-None-Match": etag})[0] == 200
+
+
+def read_event(stream) -> dict:
+    """Liest den nächsten SSE-Block mit Daten (Kommentare/retry werden übersprungen)."""
+    fields = {}
+    while True:
+        line = stream.readline().decode("utf-8").rstrip("\n")
+        if not line:
+            if "data" in fields:
+                return fields
+            continue
+        key, _, value = line.partition(": ")
+        fields[key] = value
+
+
+def test_sse_event_after_update(api):
+    state, base = api
+    state.update(scorecard([4]))
+
+    with urllib.request.urlopen(base + "/events", timeout=5) as stream:
+        assert stream.headers["Content-Type"].startswith("text/event-stream")
+        assert stream.readline() == b"retry: 15000\n"
+        state.update(scorecard([4, 3]))
+        event = read_event(stream)
+
+    assert event["event"] == "hole"
+    assert event["id"] == f"{state.boot}-1"
+    assert json.loads(event["data"])["hole_no"] == 2
+
+
+def test_sse_resume_with_last_event_id(api):
+    state, base = api
+    state.update(scorecard([4]))
+    state.update(scorecard([4, 3]))
+    state.update(scorecard([4, 3, 5]))
+
+    # Gleicher Serverlauf: nur Events nach der angegebenen ID
+    request = urllib.request.Request(base + "/events", headers={"Last-Event-ID": f"{state.boot}-1"})
+    with urllib.request.urlopen(request, timeout=5) as stream:
+        event = read_event(stream)
+    assert event["id"] == f"{state.boot}-2"
+
+    # ID aus einem früheren Lauf -> alle gepufferten Events, statt zu blockieren
+    request = urllib.request.Request(base + "/events", headers={"Last-Event-ID": "1-300"})
+    with urllib.request.urlopen(request, timeout=5) as stream:
+        event = read_event(stream)
+    assert event["id"] == f"{state.boot}-1"